@@ -10,34 +10,64 @@ Usage:
 """
 
 import argparse
+import csv
 import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-import pandas as pd
+import numpy as np
+import xlsxwriter
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; stdlib json is used otherwise
+    orjson = None
 
 DOWNLOADS_DIR = Path("Downloads")
 
+# JSON helpers, also used by main.py for metadata.json
+load_json = orjson.loads if orjson is not None else json.loads
+
+# Compact output: json's indent path falls back to the pure-Python encoder
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def dump_json(obj) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return _JSON_ENCODER.encode(obj).encode("utf-8")
+
+
+# str.translate table dropping square brackets from WebDAV file names
+_BRACKETS = str.maketrans("", "", "[]")
+
 # Lines to strip from description (Ukrainian service phrases + contacts)
 _STRIP_PATTERNS = [
-    r"Ціна[\s:–-].*",           # price line
-    r"Розміри?[\s:–-].*",       # sizes line
-    r"Для замовлення.*",        # "to order write here"
-    r"@\w+",                    # @username mentions
-    r"https?://\S+",            # any URLs
+    r"Ціна(?:[:–-].*|[^\S\r\n].*\S)",      # price line
+    r"Розміри?(?:[:–-].*|[^\S\r\n].*\S)",  # sizes line
+    r"Для замовлення.*",                    # "to order write here"
+    r"@\w+",                                # @username mentions
+    r"https?://\S+",                        # any URLs
 ]
-import re as _re
-_STRIP_RE = _re.compile("|".join(_STRIP_PATTERNS), _re.IGNORECASE)
+# Matches a whole line (with surrounding spaces) so all service lines are
+# removed in a single sub() over the description
+_STRIP_RE = re.compile(
+    r"^[^\S\n]*(?:" + "|".join(_STRIP_PATTERNS) + r")[^\S\n]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+_WS_RE = re.compile(r"\s+")
 
 
 def clean_description(text: str) -> str:
     """Remove Ukrainian service lines and contacts from description."""
-    lines = text.splitlines()
-    clean = [l for l in lines if not _STRIP_RE.fullmatch(l.strip()) and l.strip()]
-    return " ".join(clean).strip()
+    return _WS_RE.sub(" ", _STRIP_RE.sub("", text)).strip()
 
 
-_JUNK_NAME_RE = _re.compile(r"^(Ціна|Price|Cina)\b", _re.IGNORECASE)
+_JUNK_NAME_RE = re.compile(r"^(Ціна|Price|Cina)\b", re.IGNORECASE)
 
 
 def clean_name(raw_name: str, folder_name: str) -> str:
@@ -52,21 +82,59 @@ def clean_name(raw_name: str, folder_name: str) -> str:
     return name or "Unknown Brand"
 
 
+def write_csv(header: list, rows, path: Path):
+    """Write an iterable of rows to a CSV file, one product per row."""
+    # utf-8-sig adds the BOM Excel needs to show Cyrillic text correctly
+    with open(path, "w", encoding="utf-8-sig", newline="", buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def write_xlsx(header: list, rows, path: Path):
+    """Write an iterable of rows to a single "Products" sheet."""
+    # constant_memory flushes each row to disk as soon as the next one starts,
+    # so the sheet is never held in memory; rows must arrive in order
+    workbook = xlsxwriter.Workbook(str(path), {"constant_memory": True})
+    sheet = workbook.add_worksheet("Products")
+    header_format = workbook.add_format({"bold": True, "border": 1, "align": "center"})
+    sheet.write_row(0, 0, header, header_format)
+    for row_idx, row in enumerate(rows, start=1):
+        sheet.write_row(row_idx, 0, row)
+    workbook.close()
+
+
+def uah_to_eur(prices_uah) -> np.ndarray:
+    """Convert UAH prices to EUR (divide by 50, round to nearest integer)."""
+    # One vectorised pass; np.rint rounds half to even, same as round()
+    return np.rint(np.asarray(prices_uah, dtype=np.float64) / 50.0).astype(np.int64)
+
+
+def _load_meta(folder: Path) -> tuple:
+    """Read a product folder's metadata.json."""
+    return folder, load_json((folder / "metadata.json").read_bytes())
+
+
 def build_export(image_base_url: str = "", format: str = "csv"):
-    folders = sorted(
-        p for p in DOWNLOADS_DIR.iterdir()
-        if p.is_dir() and (p / "metadata.json").exists()
-    )
+    # DirEntry.is_dir() reuses the type from the directory listing, so only
+    # the metadata.json check costs a stat() per folder
+    with os.scandir(DOWNLOADS_DIR) as entries:
+        folders = sorted(
+            Path(e.path) for e in entries
+            if e.is_dir() and os.path.isfile(os.path.join(e.path, "metadata.json"))
+        )
 
     if not folders:
         print("❌ No product folders found in Downloads/")
         return
 
-    products = []
-    for folder in folders:
-        with open(folder / "metadata.json", encoding="utf-8") as f:
-            meta = json.load(f)
+    # Reads are latency-bound (especially on WebDAV mounts), so overlap them;
+    # map() keeps results in folder order
+    with ThreadPoolExecutor(max_workers=min(32, len(folders))) as executor:
+        metas = list(executor.map(_load_meta, folders))
 
+    products = []
+    for folder, meta in metas:
         # images stored as list in metadata.json
         images = meta.get("images", [])
         if isinstance(images, str):
@@ -82,49 +150,57 @@ def build_export(image_base_url: str = "", format: str = "csv"):
 
     max_images = max(len(p["images"]) for p in products)
 
-    rows = []
-    for p in products:
-        price_eur = round(p["price_uah"] / 50)
-
-        row = {
-            "Item Type": "Product",
-            "Product Name": p["name"],
-            "Category": "Clothing",
-            "Price": price_eur,
-            "Product Description": p["description"] or "",
-            "Brand Name": "",
-            "Product Weight": 0.5,
-            "Product Type": "P",
-            "Product Visible?": "Y",
-        }
-
-        for i in range(max_images):
-            col = f"Product Image File – {i + 1}"
-            if i < len(p["images"]):
-                # WebDAV files are named: FolderName__img_N.jpg
-                # Square brackets are stripped from folder name (Windows WebDAV can't copy them)
-                webdav_folder = p['folder'].replace('[', '').replace(']', '')
-                fname = f"{webdav_folder}__{p['images'][i]}"
-                if image_base_url:
-                    row[col] = f"{image_base_url.rstrip('/')}/{fname}"
-                else:
-                    row[col] = fname
+    # Build the table column by column; the writers consume these lists directly
+    n = len(products)
+    names = []
+    prices_uah = []
+    descriptions = []
+    # Pre-sized image columns; products with fewer images keep "" in the tail
+    image_cols = [[""] * n for _ in range(max_images)]
+    base = image_base_url.rstrip("/")
+
+    for row_idx, p in enumerate(products):
+        names.append(p["name"])
+        prices_uah.append(p["price_uah"])
+        descriptions.append(p["description"] or "")
+
+        # WebDAV files are named: FolderName__img_N.jpg
+        # Square brackets are stripped from folder name (Windows WebDAV can't copy them)
+        webdav_folder = p["folder"].translate(_BRACKETS)
+        for i, img in enumerate(p["images"]):
+            if image_base_url:
+                image_cols[i][row_idx] = f"{base}/{webdav_folder}__{img}"
             else:
-                row[col] = ""
-
-        rows.append(row)
-
-    df = pd.DataFrame(rows)
+                image_cols[i][row_idx] = f"{webdav_folder}__{img}"
+
+    prices = uah_to_eur(prices_uah)
+
+    data = {
+        "Item Type": ["Product"] * n,
+        "Product Name": names,
+        "Category": ["Clothing"] * n,
+        "Price": prices,
+        "Product Description": descriptions,
+        "Brand Name": [""] * n,
+        "Product Weight": [0.5] * n,
+        "Product Type": ["P"] * n,
+        "Product Visible?": ["Y"] * n,
+    }
+    for i, col in enumerate(image_cols):
+        data[f"Product Image File – {i + 1}"] = col
+
+    header = list(data)
+    columns = list(data.values())
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
     if format == "xlsx":
         out = DOWNLOADS_DIR / f"export_bigcommerce_{timestamp}.xlsx"
-        df.to_excel(out, index=False, sheet_name="Products")
+        write_xlsx(header, zip(*columns), out)
     else:
         out = DOWNLOADS_DIR / f"export_bigcommerce_{timestamp}.csv"
-        df.to_csv(out, index=False, encoding="utf-8-sig")
+        write_csv(header, zip(*columns), out)
 
-    print(f"Exported {len(rows)} products -> {out}")
+    print(f"Exported {n} products -> {out}")
     print(f"  Image columns: {max_images}")
     print(f"  Price: UAH / 50 -> EUR (rounded)")
     if image_base_url:
@@ -8,38 +8,145 @@ Downloads media, parses product metadata, and organizes into structured format.
 
 import argparse
 import asyncio
-import json
+import logging
+import logging.handlers
 import os
+import queue
 import re
+import sys
+import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-import pandas as pd
 from dotenv import load_dotenv
 from telethon import TelegramClient
-from telethon.errors import FloodWaitError
-from telethon.tl.types import Message, MessageMediaPhoto, MessageMediaDocument
+from telethon.errors import FloodWaitError, ServerError, TimedOutError
+from telethon.tl.types import (
+    InputMessagesFilterPhotos, Message, MessageMediaDocument, MessageMediaPhoto,
+)
+
+# Export writers and JSON helpers are shared with the standalone exporter
+from export_only import dump_json, load_json, uah_to_eur, write_csv, write_xlsx
+
+logger = logging.getLogger(__name__)
 
 # Constants
 SESSION_NAME = "telegram_scraper"
 DOWNLOADS_DIR = Path("Downloads")
 UNPARSED_DIR = DOWNLOADS_DIR / "Unparsed"
 
-# Regex patterns for parsing
-PRICE_PATTERNS = [
-    r"(?:Ціна|Price|Ціна\:|Price\:)\s*[:\-]?\s*(\d+)\s*(?:грн|UAH|USD|\$)?",
-    r"(\d+)\s*(?:грн|UAH|USD|\$)",
-]
+# Media kinds that can carry product photos
+_MEDIA_TYPES = (MessageMediaPhoto, MessageMediaDocument)
+
+# Download errors worth retrying; everything else fails the file immediately
+_TRANSIENT_ERRORS = (TimedOutError, ServerError, ConnectionError, TimeoutError, asyncio.TimeoutError)
+
+# Telegram albums hold at most 10 media messages, always sent back to back
+ALBUM_WINDOW = 10
 
+# Starting download rate (requests/second); halved on every FloodWait
+DOWNLOAD_RATE = 10.0
+
+# Regex patterns for parsing
 SIZE_PATTERN = r"\b(XS|S|M|L|XL|XXL)\b"
 
+# Compiled once at import; parse_product_info runs for every media message.
+# Both price forms live in one pattern used with .match(): the leading lazy
+# ".*?" makes the labelled form ("Ціна: 1500") win over a bare "800 грн"
+# anywhere in the text, exactly as when they were tried one after another.
+_PRICE_RE = re.compile(
+    r"(?:.*?(?:Ціна|Price):?\s*[:\-]?\s*(?P<labelled>\d+)"
+    r"|.*?(?P<bare>\d+)\s*(?:грн|UAH|USD|\$))",
+    re.IGNORECASE | re.DOTALL,
+)
+_SIZE_RE = re.compile(SIZE_PATTERN, re.IGNORECASE)
+# Sizes sit near the top of a post; only this many characters are scanned
+SIZE_SCAN_CHARS = 200
+_DIGIT_RE = re.compile(r"\d")
+_WORD_CHAR_RE = re.compile(r"\w")
+
+# One str.translate pass drops characters that can't be in folder names
+# and turns spaces into underscores
+_SANITIZE_TABLE = str.maketrans({" ": "_", **{c: None for c in '<>:"/\\|?*'}})
+# Underscores and any other whitespace left at either end of a folder name
+_NAME_EDGES_RE = re.compile(r"^[\s_]+|[\s_]+$")
+
+
+def _index_downloads() -> dict[int, tuple[str, dict]]:
+    """
+    Map the message_id of every product saved under DOWNLOADS_DIR to its
+    folder name and metadata (runs in a worker thread).
+    """
+    try:
+        with os.scandir(DOWNLOADS_DIR) as entries:
+            names = sorted(e.name for e in entries if e.is_dir())
+    except FileNotFoundError:
+        return {}
+
+    cached = {}
+    for name in names:
+        try:
+            metadata = load_json((DOWNLOADS_DIR / name / "metadata.json").read_bytes())
+        except (OSError, ValueError):
+            continue
+        if isinstance(metadata, dict) and isinstance(metadata.get("message_id"), int):
+            cached.setdefault(metadata["message_id"], (name, metadata))
+    return cached
+
+
+def _write_product_files(product_folder: Path, metadata: dict, raw_text: str):
+    """Write metadata.json and info.txt for one product (runs in a worker thread)."""
+    (product_folder / "metadata.json").write_bytes(dump_json(metadata))
+    (product_folder / "info.txt").write_bytes(raw_text.encode("utf-8"))
+
+
+class _RateLimiter:
+    """
+    Token bucket shared by all downloads of a scrape.
+
+    Starts optimistic at `rate` requests per second and halves the rate each
+    time Telegram answers with FloodWait, down to `min_rate`.
+    """
+
+    def __init__(self, rate: float, min_rate: float = 0.5):
+        self.rate = rate
+        self.min_rate = min_rate
+        self._tokens = max(rate, 1.0)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                # Bucket holds at most one second's worth of requests (and always one)
+                capacity = max(self.rate, 1.0)
+                self._tokens = min(capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def back_off(self):
+        """Halve the rate after a FloodWait."""
+        self.rate = max(self.min_rate, self.rate / 2)
+
 
 class TelegramScraper:
-    def __init__(self, api_id: int, api_hash: str, channel: str):
+    def __init__(self, api_id: int, api_hash: str, channel: str, concurrency: int = 4):
         self.api_id = api_id
         self.api_hash = api_hash
         self.channel = channel
+        self.concurrency = concurrency
+        self._download_sem: Optional[asyncio.Semaphore] = None  # created per scrape, see scrape_channel
+        self._limiter: Optional[_RateLimiter] = None  # created per scrape, see scrape_channel
+        self._cached: dict[int, tuple[str, dict]] = {}  # message_id -> saved product, see scrape_channel
+        self._folder_owners: dict[str, int] = {}  # folder name -> message_id, see scrape_channel
+        self._entity = None  # resolved channel, see _get_entity
         self.client = TelegramClient(SESSION_NAME, api_id, api_hash)
         self.products = []
         self.unparsed_count = 0
@@ -47,12 +154,22 @@ class TelegramScraper:
     async def start(self):
         """Start the Telegram client and authenticate."""
         await self.client.start()
-        print(f"✓ Logged in as {(await self.client.get_me()).first_name}")
+        # get_me() is an extra round-trip only needed for the account name
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("✓ Logged in as %s", (await self.client.get_me()).first_name)
+        else:
+            logger.info("✓ Logged in")
 
     async def stop(self):
         """Disconnect the client."""
         await self.client.disconnect()
 
+    async def _get_entity(self):
+        """Resolve the channel once; repeated username lookups can trigger FloodWait."""
+        if self._entity is None:
+            self._entity = await self.client.get_entity(self.channel)
+        return self._entity
+
     def parse_product_info(self, message_text: str) -> Optional[dict]:
         """
         Extract product name, price, and attributes from message text.
@@ -61,27 +178,37 @@ class TelegramScraper:
         if not message_text or not message_text.strip():
             return None
 
-        lines = message_text.strip().split("\n")
-        name = lines[0].strip() if lines else None
+        # Every price form needs a digit; captions without one (announcements,
+        # greetings) are rejected before running the price regex
+        if _DIGIT_RE.search(message_text) is None:
+            return None
 
         # Extract price
-        price = None
-        for pattern in PRICE_PATTERNS:
-            match = re.search(pattern, message_text, re.IGNORECASE)
-            if match:
-                price = int(match.group(1))
-                break
+        match = _PRICE_RE.match(message_text)
+        price = int(match.group("labelled") or match.group("bare")) if match else None
 
         # If no price found, cannot be a product post
         if price is None:
             return None
 
-        # Extract size if present
-        size_match = re.search(SIZE_PATTERN, message_text, re.IGNORECASE)
+        # First line is the name; only scan up to it rather than splitting every line
+        head, _, tail = message_text.lstrip().partition("\n")
+        name = head.strip()
+
+        # Extract size if present; endpos bounds the scan on long descriptions
+        size_match = _SIZE_RE.search(message_text, 0, SIZE_SCAN_CHARS)
+        # endpos acts as the end of the string, so \b also matches at the cut;
+        # a match ending there inside a longer word ("Summer") is not a size
+        if (
+            size_match is not None
+            and size_match.end() == SIZE_SCAN_CHARS
+            and _WORD_CHAR_RE.match(message_text, SIZE_SCAN_CHARS)
+        ):
+            size_match = None
         size = size_match.group(1).upper() if size_match else None
 
         # Description is everything after the first line
-        description = "\n".join(lines[1:]).strip() if len(lines) > 1 else ""
+        description = tail.strip()
 
         return {
             "name": self._sanitize_name(name),
@@ -93,101 +220,120 @@ class TelegramScraper:
 
     def _sanitize_name(self, name: str) -> str:
         """Sanitize product name for folder creation."""
-        # Remove special characters that can't be in folder names
-        name = re.sub(r'[<>:"/\\|?*]', "", name)
-        # Limit length
-        name = name[:50].strip()
-        # Replace spaces with underscores
-        name = name.replace(" ", "_")
-        return name
-
-    async def download_media_list(self, messages: list, product_folder: Path) -> list:
-        """Download all media from a list of messages (single or album) to the product folder."""
-        downloaded_files = []
-
-        for idx, msg in enumerate(messages):
-            if not isinstance(msg.media, (MessageMediaPhoto, MessageMediaDocument)):
-                continue
-            dest = str(product_folder / f"img_{idx + 1}.jpg")
-            for attempt in range(1, 4):  # up to 3 attempts
-                try:
-                    file_path = await self.client.download_media(msg.media, file=dest)
-                    if file_path:
-                        downloaded_files.append(os.path.basename(file_path))
-                    break
-                except Exception as e:
-                    if attempt == 3:
-                        print(f"    ⚠ Skipped img_{idx + 1} after 3 attempts: {e}")
-                    else:
-                        wait = attempt * 3
-                        print(f"    ↻ Retry {attempt}/3 for img_{idx + 1} in {wait}s...")
-                        await asyncio.sleep(wait)
+        # Remove forbidden characters and replace spaces, then limit length.
+        # Dropping a character can expose a tab or other whitespace at the
+        # ends, which Windows rejects in folder names, so trim those too
+        return _NAME_EDGES_RE.sub("", name.translate(_SANITIZE_TABLE)[:50])
 
-        return downloaded_files
+    async def _download_one(self, msg: Message, product_folder: Path, name: str) -> Optional[str]:
+        """
+        Download a single media file.
 
-    async def scrape_channel(self, limit: int = 100):
+        FloodWait and network/timeout errors are retried (up to 3 attempts,
+        exponential backoff); anything else, e.g. an expired file reference,
+        is raised straight away since retrying cannot fix it.
         """
-        Scrape product posts from the channel.
+        dest = str(product_folder / name)
+        for attempt in range(1, 4):  # up to 3 attempts
+            try:
+                # The slot is released before any backoff sleep below
+                async with self._download_sem:
+                    await self._limiter.acquire()
+                    return await self.client.download_media(msg.media, file=dest)
+            except FloodWaitError as e:
+                self._limiter.back_off()
+                if attempt == 3:
+                    raise
+                wait = e.seconds
+            except _TRANSIENT_ERRORS:
+                if attempt == 3:
+                    raise
+                wait = 2 ** attempt
+            logger.warning(
+                "    ↻ Retry %d/3 for %s/%s in %ss...", attempt, product_folder.name, name, wait
+            )
+            await asyncio.sleep(wait)
 
-        Args:
-            limit: Number of messages to scan
+    async def download_media_list(self, messages: list, product_folder: Path) -> list:
+        """
+        Download all media from a list of messages (single or album) to the product folder.
+        Every message must carry product media; scrape_channel only groups those.
         """
-        print(f"\n📡 Scanning last {limit} messages from {self.channel}...")
+        names = [f"img_{idx + 1}.jpg" for idx in range(len(messages))]
+        tasks = [
+            self._download_one(msg, product_folder, name)
+            for msg, name in zip(messages, names)
+        ]
 
-        entity = await self.client.get_entity(self.channel)
-        messages = await self.client.get_messages(entity, limit=limit)
+        # All images of an album are fetched concurrently
+        results = await asyncio.gather(*tasks, return_exceptions=True)
 
-        # Group messages into products (albums share a grouped_id; singles stand alone).
-        # messages are ordered newest-first; preserve that order.
-        seen_group_ids = set()
-        groups: list[tuple[Message, list[Message]]] = []  # (lead_msg, all_msgs_in_group)
-
-        for msg in messages:
-            if not isinstance(msg.media, (MessageMediaPhoto, MessageMediaDocument)):
-                continue
-
-            if msg.grouped_id:
-                if msg.grouped_id in seen_group_ids:
-                    # Already added as part of a group — append to it
-                    for lead, group in groups:
-                        if lead.grouped_id == msg.grouped_id:
-                            group.append(msg)
-                            break
-                else:
-                    seen_group_ids.add(msg.grouped_id)
-                    groups.append((msg, [msg]))
-            else:
-                groups.append((msg, [msg]))
-
-        # Filter to only groups where any message has parseable product text
-        valid_groups = []
-        for lead, group in groups:
-            # The text can be on any message in the album (usually the last one)
-            text = next((m.message for m in group if m.message), None)
-            if text and self.parse_product_info(text) is not None:
-                valid_groups.append((lead, group, text))
-            else:
-                self.unparsed_count += 1
+        downloaded_files = []
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logger.warning("    ⚠ Skipped %s/%s: %s", product_folder.name, name, result)
+            elif result:
+                # The target has an extension, so Telethon saves under exactly this name
+                downloaded_files.append(name)
 
-        total = len(valid_groups)
-        print(f"  Found {total} product messages to download...")
+        return downloaded_files
+
+    def _load_cached_product(self, lead: Message, media_count: int) -> Optional[dict]:
+        """
+        Return the export row for a product downloaded by a previous run, or
+        None if it was never saved or has a different number of images.
+        """
+        cached = self._cached.get(lead.id)
+        if cached is None:
+            return None
+        folder_name, metadata = cached
+        images = metadata.get("images")
+        if not isinstance(images, list) or len(images) != media_count:
+            return None
+        return {
+            "name": metadata.get("name", ""),
+            "price": metadata.get("price", 0),
+            "size": metadata.get("size"),
+            "description": metadata.get("description", ""),
+            "images": images,
+            "folder": folder_name,
+        }
 
-        for idx, (lead, group, text) in enumerate(valid_groups):
+    async def _process_product(
+        self,
+        sem: asyncio.Semaphore,
+        idx: int,
+        width: int,
+        lead: Message,
+        group: list[Message],
+        product_info: dict,
+    ) -> Optional[dict]:
+        """Download one product and write its folder. Returns the export row or None."""
+        async with sem:
             product_num = idx + 1  # 1 = newest post in Telegram
-            product_info = self.parse_product_info(text)
 
-            # Create product folder
-            num_str = str(product_num).zfill(len(str(total)))
+            # Reuse a product completed by an earlier run, wherever its folder
+            # is; numbers shift as new posts arrive (groups hold only media messages)
+            cached = self._load_cached_product(lead, len(group))
+            if cached is not None:
+                logger.info("  ↻ Skipped (cached): %s", cached["folder"])
+                return cached
+
+            # Product folder path; Telethon's download_media creates it on the
+            # first file written, so products with no media never leave one behind
+            num_str = str(product_num).zfill(width)
             folder_name = f"{num_str}_{product_info['name']}_{product_info['price']}"
+            if self._folder_owners.get(folder_name, lead.id) != lead.id:
+                # An earlier run saved another post under this number; keep it
+                folder_name = f"{num_str}-{lead.id}_{product_info['name']}_{product_info['price']}"
             product_folder = DOWNLOADS_DIR / folder_name
-            product_folder.mkdir(parents=True, exist_ok=True)
 
             # Download media — pass all messages in the album
             downloaded_files = await self.download_media_list(group, product_folder)
 
             if not downloaded_files:
                 # No media downloaded, skip
-                continue
+                return None
 
             # Save metadata
             metadata = {
@@ -200,31 +346,122 @@ class TelegramScraper:
                 "message_id": lead.id,
             }
 
-            # Save metadata.json
-            with open(product_folder / "metadata.json", "w", encoding="utf-8") as f:
-                json.dump(metadata, f, indent=2, ensure_ascii=False)
+            # Save metadata.json and the raw text backup (info.txt) off the
+            # event loop so other products keep downloading during disk I/O
+            await asyncio.to_thread(
+                _write_product_files, product_folder, metadata, product_info["raw_text"]
+            )
 
-            # Save raw text backup
-            with open(product_folder / "info.txt", "w", encoding="utf-8") as f:
-                f.write(product_info["raw_text"])
+            logger.info("  ✓ Downloaded: %s (%d images)", folder_name, len(downloaded_files))
 
-            self.products.append({
+            return {
                 "name": product_info["name"],
                 "price": product_info["price"],
                 "size": product_info["size"],
                 "description": product_info["description"],
-                "images": ";".join(downloaded_files),
+                "images": downloaded_files,
                 "folder": folder_name,
-            })
+            }
 
-            print(f"  ✓ Downloaded: {folder_name} ({len(downloaded_files)} images)")
+    async def scrape_channel(self, limit: int = 100, photos_only: bool = False):
+        """
+        Scrape product posts from the channel.
 
-            # Rate limiting to avoid FloodWait
-            await asyncio.sleep(1.0)
+        Args:
+            limit: Number of messages to scan
+            photos_only: Let Telegram filter to photo messages server-side, so text
+                         posts are never transferred. Images sent as files are
+                         skipped, and `limit` then counts photos only.
+        """
+        kind = "photo messages" if photos_only else "messages"
+        logger.info("\n📡 Scanning last %d %s from %s...", limit, kind, self.channel)
+
+        entity = await self._get_entity()
+
+        # Products saved by earlier runs are found by message id, since folder
+        # numbers change with new posts and with --limit
+        self._cached = await asyncio.to_thread(_index_downloads)
+        self._folder_owners = {name: message_id for message_id, (name, _) in self._cached.items()}
+
+        # Products are downloaded concurrently while later messages are still
+        # being fetched; the semaphore bounds how many are in flight so we stay
+        # under Telegram's flood limits.
+        sem = asyncio.Semaphore(self.concurrency)
+        # Album images are fetched in parallel too, so cap the number of media
+        # transfers in flight across all products, not just the product count
+        self._download_sem = asyncio.Semaphore(self.concurrency)
+        self._limiter = _RateLimiter(DOWNLOAD_RATE)
+        tasks: list[asyncio.Task] = []
+        # The product count isn't known until the scan ends, so folder numbers
+        # are padded to the widest number the scan could reach
+        width = len(str(limit))
+
+        def start_download(lead: Message, group: list[Message]):
+            # The text can be on any message in the album (usually the last one)
+            text = next((m.message for m in group if m.message), None)
+            product_info = self.parse_product_info(text) if text else None
+            if product_info is None:
+                self.unparsed_count += 1
+                return
+            tasks.append(asyncio.create_task(
+                self._process_product(sem, len(tasks), width, lead, group, product_info)
+            ))
 
-        print(f"\n📊 Summary:")
-        print(f"  • Products downloaded: {len(self.products)}")
-        print(f"  • Unparsed media messages: {self.unparsed_count}")
+        # Group messages into products (albums share a grouped_id; singles stand alone).
+        # Messages arrive newest-first. Album members are sent back to back, so a
+        # group is complete once ALBUM_WINDOW messages have passed its lead;
+        # groups are started strictly in arrival order so numbering stays newest-first.
+        pending: deque[tuple[int, Message, list[Message]]] = deque()  # (position, lead_msg, all_msgs_in_group)
+        group_by_id: dict[int, list[Message]] = {}  # grouped_id -> list shared with pending
+
+        try:
+            position = 0
+            message_filter = InputMessagesFilterPhotos() if photos_only else None
+            async for msg in self.client.iter_messages(entity, limit=limit, filter=message_filter):
+                position += 1
+                while pending and position - pending[0][0] >= ALBUM_WINDOW:
+                    _, lead, group = pending.popleft()
+                    group_by_id.pop(lead.grouped_id, None)
+                    start_download(lead, group)
+
+                if not isinstance(msg.media, _MEDIA_TYPES):
+                    continue
+
+                if msg.grouped_id:
+                    group = group_by_id.get(msg.grouped_id)
+                    if group is None:
+                        group = [msg]
+                        group_by_id[msg.grouped_id] = group
+                        pending.append((position, msg, group))
+                    else:
+                        # Already added as part of a group — append to it
+                        group.append(msg)
+                else:
+                    pending.append((position, msg, [msg]))
+        except BaseException:
+            # Don't leave downloads running against a client that is about to disconnect
+            for task in tasks:
+                task.cancel()
+            raise
+
+        for _, lead, group in pending:
+            start_download(lead, group)
+
+        logger.info("  Found %d product messages to download...", len(tasks))
+
+        # A failing product is logged and dropped rather than aborting the scrape,
+        # which would discard the finished products and leave the rest running
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # gather preserves order, so products stay newest-first
+        for product_num, result in enumerate(results, start=1):
+            if isinstance(result, Exception):
+                logger.warning("  ⚠ Skipped product %d: %s", product_num, result)
+            elif result is not None:
+                self.products.append(result)
+
+        logger.info("\n📊 Summary:")
+        logger.info("  • Products downloaded: %d", len(self.products))
+        logger.info("  • Unparsed media messages: %d", self.unparsed_count)
 
     def generate_export(self, format: str = "csv", image_base_url: str = ""):
         """
@@ -236,58 +473,45 @@ class TelegramScraper:
                             If empty, just the filename is used (for WebDAV imports).
         """
         if not self.products:
-            print("\n⚠ No products to export.")
+            logger.warning("\n⚠ No products to export.")
             return
 
         # Find max number of images across all products
-        max_images = max(
-            len(p["images"].split(";")) for p in self.products
-        )
-
-        rows = []
-        for p in self.products:
-            image_files = p["images"].split(";")
-
-            # Convert price: UAH → EUR (divide by 50, round to nearest integer)
-            price_uah = p["price"]
-            price_eur = round(price_uah / 50)
-
-            row = {
-                "Item Type": "Product",
-                "Name": p["name"].replace("_", " "),
-                "Price": price_eur,
-                "Description": p["description"],
-                "Brand Name": "",
-                "Weight": 0.5,
-                "Type": "P",
-                "Is Visible": "Y",
-            }
+        max_images = max(len(p["images"]) for p in self.products)
 
-            # Add image columns: Product Image File – 1, 2, 3, ...
-            for i in range(max_images):
-                col = f"Product Image File – {i + 1}"
-                if i < len(image_files):
-                    fname = image_files[i]
-                    row[col] = f"{image_base_url.rstrip('/')}/{fname}" if image_base_url else fname
-                else:
-                    row[col] = ""
+        n = len(self.products)
+        base = image_base_url.rstrip("/")
 
-            rows.append(row)
+        prices = uah_to_eur([p["price"] for p in self.products])
 
-        df = pd.DataFrame(rows)
+        header = [
+            "Item Type", "Name", "Price", "Description",
+            "Brand Name", "Weight", "Type", "Is Visible",
+        ] + [f"Product Image File – {i + 1}" for i in range(max_images)]
+
+        def rows():
+            # Rows are produced one at a time as the writer consumes them,
+            # so no second copy of the catalog is held in memory
+            for p, price in zip(self.products, prices):
+                images = [f"{base}/{fname}" if image_base_url else fname for fname in p["images"]]
+                images += [""] * (max_images - len(images))
+                yield [
+                    "Product", p["name"].replace("_", " "), price, p["description"],
+                    "", 0.5, "P", "Y", *images,
+                ]
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
         if format == "xlsx":
             export_path = DOWNLOADS_DIR / f"export_bigcommerce_{timestamp}.xlsx"
-            df.to_excel(export_path, index=False, sheet_name="Products")
+            write_xlsx(header, rows(), export_path)
         else:
             export_path = DOWNLOADS_DIR / f"export_bigcommerce_{timestamp}.csv"
-            df.to_csv(export_path, index=False, encoding="utf-8-sig")
+            write_csv(header, rows(), export_path)
 
-        print(f"\n💾 BigCommerce export saved: {export_path}")
-        print(f"   Products: {len(rows)}, Image columns: {max_images}")
-        print(f"   Price conversion: UAH ÷ 50 → EUR (rounded)")
+        logger.info("\n💾 BigCommerce export saved: %s", export_path)
+        logger.info("   Products: %d, Image columns: %d", n, max_images)
+        logger.info("   Price conversion: UAH ÷ 50 → EUR (rounded)")
 
 
 async def main():
@@ -311,6 +535,12 @@ async def main():
         default="csv",
         help="Export format (default: csv)"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Number of parallel downloads (default: 4)"
+    )
     parser.add_argument(
         "--image-base-url",
         type=str,
@@ -319,8 +549,43 @@ async def main():
              "Leave empty for WebDAV imports (filename only)."
     )
 
+    parser.add_argument(
+        "--photos-only",
+        action="store_true",
+        help="Only fetch photo messages (faster on busy channels; skips images "
+             "sent as files, and --limit counts photos)"
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Show extra details, such as the logged-in account name"
+    )
+
     args = parser.parse_args()
+    if args.concurrency < 1:
+        # Semaphore(0) would block every download and hang the scrape
+        parser.error("--concurrency must be at least 1")
+
+    # Log records are queued and written to the console by a background
+    # thread, so terminal I/O never stalls the download loop
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+    logging.basicConfig(
+        level=logging.WARNING,
+        format="%(message)s",
+        handlers=[logging.handlers.QueueHandler(log_queue)],
+    )
+    logger.setLevel(logging.DEBUG if args.verbose else logging.INFO)
+
+    listener.start()
+    try:
+        await run_scraper(args)
+    finally:
+        listener.stop()
+
 
+async def run_scraper(args: argparse.Namespace):
+    """Validate settings, then scrape the channel and write the export."""
     # Load environment variables
     load_dotenv()
 
@@ -330,28 +595,28 @@ async def main():
 
     # Validate credentials
     if not api_id or not api_hash:
-        print("❌ Error: API_ID and API_HASH must be set in .env file")
-        print("   Get credentials from https://my.telegram.org/apps")
+        logger.error("❌ Error: API_ID and API_HASH must be set in .env file")
+        logger.error("   Get credentials from https://my.telegram.org/apps")
         return
 
     if not channel:
-        print("❌ Error: CHANNEL must be set in .env or provided via --channel")
+        logger.error("❌ Error: CHANNEL must be set in .env or provided via --channel")
         return
 
     # Create output directories
     DOWNLOADS_DIR.mkdir(exist_ok=True)
     UNPARSED_DIR.mkdir(exist_ok=True)
 
-    scraper = TelegramScraper(int(api_id), api_hash, channel)
+    scraper = TelegramScraper(int(api_id), api_hash, channel, concurrency=args.concurrency)
 
     try:
         await scraper.start()
-        await scraper.scrape_channel(limit=args.limit)
+        await scraper.scrape_channel(limit=args.limit, photos_only=args.photos_only)
         scraper.generate_export(format=args.export_format, image_base_url=args.image_base_url)
     except FloodWaitError as e:
-        print(f"\n⚠ Rate limited. Please wait {e.seconds} seconds and try again.")
+        logger.warning("\n⚠ Rate limited. Please wait %d seconds and try again.", e.seconds)
     except Exception as e:
-        print(f"\n❌ Error: {e}")
+        logger.error("\n❌ Error: %s", e)
         raise
     finally:
         await scraper.stop()